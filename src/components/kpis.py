@@ -209,7 +209,7 @@ def create_workstream_fte_chart(assignments_df: pd.DataFrame) -> None:
     st.subheader("📊 Workstream FTE Distribution")
 
     # Calculate FTE by workstream
-    ws_fte = assignments_df.groupby('workstream')['allocation_pct'].sum() / 100.0
+    ws_fte = assignments_df.groupby('workstream', observed=True)['allocation_pct'].sum() / 100.0
     ws_fte = ws_fte.sort_values(ascending=False)
 
     # Show top 10 workstreams
@@ -0,0 +1,44 @@
+"""
+Pagination component for PET Resource Allocation Dashboard
+Sends large tables to the browser one page at a time
+"""
+
+import streamlit as st
+import pandas as pd
+
+# Rows rendered per table page
+DEFAULT_PAGE_SIZE = 200
+
+def paginate(df: pd.DataFrame, key: str, page_size: int = DEFAULT_PAGE_SIZE) -> pd.DataFrame:
+    """
+    Slice a DataFrame to the page chosen in a page selector
+
+    Tables that fit on a single page are returned as-is, without a selector.
+
+    Args:
+        df: DataFrame to paginate
+        key: Unique widget key for the page selector
+        page_size: Rows per page
+
+    Returns:
+        The rows on the selected page
+    """
+
+    if len(df) <= page_size:
+        return df
+
+    page_count = -(-len(df) // page_size)
+    page = st.number_input(
+        "Page",
+        min_value=1,
+        max_value=page_count,
+        value=1,
+        step=1,
+        key=key
+    )
+
+    start = (page - 1) * page_size
+    end = min(start + page_size, len(df))
+    st.caption(f"Showing rows {start + 1:,}–{end:,} of {len(df):,} (page {page} of {page_count:,})")
+
+    return df.iloc[start:end]
@@ -6,6 +6,7 @@ Based on new-requirements.txt specification
 import pandas as pd
 import re
 import logging
+import weakref
 from typing import Tuple, List, Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,25 @@ SENTINELS = {"Supervisor or Hiring Manager", "Resource or Rec/Offer", "L3 Org"}
 WS_NAME_RE = re.compile(r"^\s*Workstream\s*(\d+)\s*$", re.I)
 PCT_NAME_RE = re.compile(r"^\s*%+\s*(\d+)\s*$", re.I)
 
+# Low-cardinality columns the org and workstream views group and filter on;
+# categorical codes let groupby/isin/merge hash integers instead of strings
+PEOPLE_CATEGORY_COLS = ['l3_org', 'vp_org', 'director_org', 'manager', 'type']
+ASSIGNMENT_CATEGORY_COLS = ['workstream']
+
+# Content hashes precomputed at ingest, keyed by id() of the frame they describe.
+# DataFrames are unhashable, so a WeakKeyDictionary can't hold them; a finalizer
+# drops each entry when its frame is collected, before the id can be reused.
+_FRAME_DIGESTS: Dict[int, bytes] = {}
+
+def store_frame_digest(df: pd.DataFrame) -> None:
+    """Hash df's contents once so cache layers can key on it without rehashing"""
+    _FRAME_DIGESTS[id(df)] = pd.util.hash_pandas_object(df, index=True).values.tobytes()
+    weakref.finalize(df, _FRAME_DIGESTS.pop, id(df), None)
+
+def frame_digest(df: pd.DataFrame):
+    """Digest stored by store_frame_digest for this exact frame, or None"""
+    return _FRAME_DIGESTS.get(id(df))
+
 def _likely_header_row(row_vals) -> bool:
     """Check if a row likely contains header information"""
     vals = {str(v).strip() for v in row_vals if pd.notna(v)}
@@ -142,6 +162,11 @@ def process_workstream_goals_csv(csv_path: str) -> pd.DataFrame:
                         errors='coerce'
                     )
             
+            # Narrow the headcount column every groupby scans (NaN keeps it float);
+            # Allocation % stays float64 so averages match the displayed precision
+            if 'Target FTE Headcount' in goals_df.columns:
+                goals_df['Target FTE Headcount'] = pd.to_numeric(goals_df['Target FTE Headcount'], downcast='integer')
+            
             # Convert boolean columns
             bool_cols = ['Active', 'Inactive Override']
             for col in bool_cols:
@@ -157,6 +182,16 @@ def process_workstream_goals_csv(csv_path: str) -> pd.DataFrame:
             # Remove rows with missing essential data
             goals_df = goals_df.dropna(subset=['Workstream Name', 'Goal Name'])
             
+            # Low-cardinality identifiers used as groupby keys and filter options;
+            # categorical codes make groupby/isin/pivot hash integers, not strings
+            category_cols = ['Workstream Name', 'Goal Name', 'L4 Leaders', 'Benefit L2']
+            for col in category_cols:
+                if col in goals_df.columns:
+                    goals_df[col] = goals_df[col].astype('category')
+            
+            # Hash once here so every cached view helper keys on goals_df for free
+            store_frame_digest(goals_df)
+            
             logger.info(f"Processed {len(goals_df)} goal-workstream mappings from {len(unique_goals)} goals")
             return goals_df
         else:
@@ -169,6 +204,13 @@ def process_workstream_goals_csv(csv_path: str) -> pd.DataFrame:
         logger.error(traceback.format_exc())
         return pd.DataFrame()
 
+def categorize_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Cast the listed columns that are present in df to categorical dtype"""
+    present = [col for col in columns if col in df.columns]
+    if not present:
+        return df
+    return df.astype({col: 'category' for col in present})
+
 def find_workstream_pairs(cols):
     """Dynamically find workstream and percentage column pairs"""
     ws_cols = {}
@@ -285,10 +327,11 @@ def load_latest_csv(csv_path: str) -> pd.DataFrame:
     # Convert total_allocation_pct to numeric for comparisons
     df["total_allocation_pct"] = pd.to_numeric(df["total_allocation_pct"], errors='coerce').fillna(0)
 
-    # flags
-    df["overallocated"] = df["total_allocation_pct"] > 100.0
-    df["underallocated"] = df["total_allocation_pct"] < 100.0
-    df["unassigned"] = df["total_allocation_pct"] == 0.0
+    # flags, computed once here from a single NumPy view so views only read them
+    total_pct = df["total_allocation_pct"].to_numpy()
+    df["overallocated"] = total_pct > 100.0
+    df["underallocated"] = total_pct < 100.0
+    df["unassigned"] = total_pct == 0.0
     return df
 
 def create_hierarchical_summary(df: pd.DataFrame) -> pd.DataFrame:
@@ -6,52 +6,196 @@ Handles monitoring the data folder and managing the latest file
 import os
 import re
 import time
+import heapq
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Iterator
 from datetime import datetime
 import logging
 
 from .schema import WATCH_PATTERN, WATCH_INTERVAL_SECONDS, MAX_BACKUP_FILES
-from .etl import process_pet_csv
+from .etl import process_pet_csv, categorize_columns, PEOPLE_CATEGORY_COLS, ASSIGNMENT_CATEGORY_COLS
 
 logger = logging.getLogger(__name__)
 
+# Number of parsed files kept in memory, keyed by (path, mtime_ns, size)
+ETL_CACHE_SIZE = 2
+
+# Uploads at least this large get their disk space preallocated
+LARGE_UPLOAD_BYTES = 8 * 1024 * 1024
+
+# Directory scans are only memoized once the directory's mtime is at least this
+# old; filesystems with coarse timestamps (FAT: 2 s) can give a later change
+# the same mtime
+SCAN_MTIME_SLACK_NS = 2_000_000_000
+
+_WATCH_RE = re.compile(WATCH_PATTERN, re.IGNORECASE)
+
+def _fast_reject(name: str) -> bool:
+    """Cheap filename check that rules out most non-PET files before regex and stat"""
+    return "pet" not in name.lower()
+
+# Unlinks are overlapped so cleanup on network/Windows filesystems costs
+# roughly one round-trip instead of one per file
+_CLEANUP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pet-cleanup")
+
+def _safe_unlink(file_path: Path, description: str) -> None:
+    """Remove a file, logging instead of raising on failure"""
+    try:
+        file_path.unlink()
+        logger.info(f"{description}: {file_path}")
+    except OSError as e:
+        logger.warning(f"Could not remove old file {file_path}: {e}")
+
+def _unlink_files(file_paths: List[Path], description: str) -> None:
+    """Remove files concurrently on the cleanup pool and wait for completion"""
+    futures = [_CLEANUP_POOL.submit(_safe_unlink, file_path, description) for file_path in file_paths]
+    wait(futures)
+
+def _write_file(file_path: Path, content) -> None:
+    """Write a bytes-like object to disk, preallocating space for large files"""
+    size = len(content) if isinstance(content, bytes) else content.nbytes
+    with open(file_path, 'wb') as f:
+        if size >= LARGE_UPLOAD_BYTES and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError:
+                # Not supported on every filesystem; the write still works
+                pass
+        f.write(content)
+
+def _locked(method):
+    """Run a PETDataStore method while holding the instance lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class PETDataStore:
     """Manages file watching and data storage for PET dashboard"""
 
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        # Reentrant because load_data calls should_refresh
+        self._lock = threading.RLock()
         self.last_check_time = 0
         self.current_file: Optional[Path] = None
         self.current_data = None
-        self.last_modified: Optional[datetime] = None
+        self.last_modified_ns: Optional[int] = None
+        self._etl_cache: Dict[Tuple, Tuple] = {}
+        self._scan_cache: Optional[Tuple[int, List[str]]] = None
 
-    def find_latest_file(self) -> Optional[Tuple[Path, datetime]]:
+    def _iter_csv_entries(self) -> Iterator[os.DirEntry]:
         """
-        Find the most recently modified PET CSV file in the data directory
+        Iterate over CSV files in the data directory
+
+        Uses os.scandir with a plain suffix check instead of Path.glob, so no
+        fnmatch pattern or Path objects are built for non-matching entries.
+
+        Yields:
+            Directory entries for regular files ending in .csv
+        """
+        endswith = str.endswith
+        with os.scandir(self.data_dir) as it:
+            for entry in it:
+                if not endswith(entry.name, ".csv"):
+                    continue
+                try:
+                    if entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+
+    def _scan_matching(self) -> List[Tuple[str, os.stat_result]]:
+        """
+        Scan the data directory for PET CSV files
+
+        The list of matching paths is memoized on the directory's own
+        st_mtime_ns, which only changes when entries are added or removed.
+        Files rewritten in place leave it unchanged, so every call stats the
+        paths afresh rather than reusing stat results from the scan. A scan
+        is not reused when the directory changed within SCAN_MTIME_SLACK_NS of
+        it (a later change could share the coarse mtime), or when one of its
+        paths has disappeared.
 
         Returns:
-            Tuple of (file_path, modification_time) or None if no files found
+            List of (path, stat_result) for matching files whose stat succeeded
         """
-        if not self.data_dir.exists():
+        dir_mtime_ns = self._dir_mtime_ns()
+        if dir_mtime_ns is None:
+            return []
+
+        # Read once: _invalidate_scan may reset the attribute from another thread
+        scan_cache = self._scan_cache
+        if scan_cache is not None and scan_cache[0] == dir_mtime_ns:
+            matches = self._stat_paths(scan_cache[1])
+            if matches is not None:
+                return matches
+
+        scanned_at_ns = time.time_ns()
+        paths = []
+        # Bind hot-loop lookups to locals; matters for directories with many CSVs
+        search = _WATCH_RE.search
+        reject = _fast_reject
+        append = paths.append
+        try:
+            for entry in self._iter_csv_entries():
+                name = entry.name
+                if reject(name) or not search(name):
+                    continue
+                append(entry.path)
+        except OSError:
+            return []
+
+        trusted = scanned_at_ns - dir_mtime_ns > SCAN_MTIME_SLACK_NS
+        self._scan_cache = (dir_mtime_ns, paths) if trusted else None
+        return self._stat_paths(paths, missing_ok=True)
+
+    @staticmethod
+    def _stat_paths(paths: List[str], missing_ok: bool = False) -> Optional[List[Tuple[str, os.stat_result]]]:
+        """Stat each path; None if one has vanished (unless missing_ok)"""
+        matches = []
+        for path in paths:
+            try:
+                matches.append((path, os.stat(path)))
+            except FileNotFoundError:
+                if not missing_ok:
+                    return None
+            except OSError as e:
+                logger.warning(f"Could not access file {path}: {e}")
+        return matches
+
+    def _dir_mtime_ns(self) -> Optional[int]:
+        """Return the data directory's st_mtime_ns, or None if it is missing"""
+        try:
+            return os.stat(self.data_dir).st_mtime_ns
+        except OSError:
             return None
 
-        matching_files = []
-        for file_path in self.data_dir.glob("*.csv"):
-            if re.search(WATCH_PATTERN, file_path.name, re.IGNORECASE):
-                try:
-                    mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    matching_files.append((file_path, mtime))
-                except OSError as e:
-                    logger.warning(f"Could not access file {file_path}: {e}")
+    def _invalidate_scan(self) -> None:
+        """Drop the memoized directory scan after files are added or removed"""
+        self._scan_cache = None
 
-        if not matching_files:
+    def find_latest_file(self) -> Optional[Tuple[Path, int]]:
+        """
+        Find the most recently modified PET CSV file in the data directory
+
+        Returns:
+            Tuple of (file_path, st_mtime_ns) or None if no files found
+        """
+        matches = self._scan_matching()
+        if not matches:
             return None
 
         # Return the most recently modified file
-        return max(matching_files, key=lambda x: x[1])
+        latest_path, latest_stat = max(matches, key=lambda m: m[1].st_mtime_ns)
+        return Path(latest_path), latest_stat.st_mtime_ns
 
+    @_locked
     def should_refresh(self) -> bool:
         """
         Check if data should be refreshed based on file changes or time interval
@@ -76,24 +220,25 @@ class PETDataStore:
                 logger.info("No PET CSV files found, clearing data")
                 self.current_file = None
                 self.current_data = None
-                self.last_modified = None
+                self.last_modified_ns = None
                 return True
             return False
 
-        file_path, file_mtime = latest_file_info
+        file_path, file_mtime_ns = latest_file_info
 
         # Check if file has changed
         if (self.current_file != file_path or
-            self.last_modified is None or
-            file_mtime > self.last_modified):
+            self.last_modified_ns is None or
+            file_mtime_ns > self.last_modified_ns):
 
             logger.info(f"New or updated file detected: {file_path}")
             self.current_file = file_path
-            self.last_modified = file_mtime
+            self.last_modified_ns = file_mtime_ns
             return True
 
         return False
 
+    @_locked
     def load_data(self, force_refresh: bool = False) -> Optional[Tuple]:
         """
         Load and process the latest PET CSV file
@@ -111,14 +256,32 @@ class PETDataStore:
             latest_file_info = self.find_latest_file()
             if latest_file_info is None:
                 return None
-            self.current_file, self.last_modified = latest_file_info
+            self.current_file, self.last_modified_ns = latest_file_info
 
         try:
+            file_stat = self.current_file.stat()
+            cache_key = (str(self.current_file), file_stat.st_mtime_ns, file_stat.st_size)
+
+            cached = self._etl_cache.pop(cache_key, None)
+            if cached is not None:
+                # Re-insert to mark as most recently used
+                self._etl_cache[cache_key] = cached
+                self.current_data = cached
+                return self.current_data
+
             logger.info(f"Processing file: {self.current_file}")
             people_df, assignments_df, capabilities_df, stats = process_pet_csv(self.current_file)
+            # Categorical group/filter keys for the org and workstream views
+            people_df = categorize_columns(people_df, PEOPLE_CATEGORY_COLS)
+            assignments_df = categorize_columns(assignments_df, ASSIGNMENT_CATEGORY_COLS)
 
             self.current_data = (people_df, assignments_df, capabilities_df, stats)
 
+            self._etl_cache[cache_key] = self.current_data
+            while len(self._etl_cache) > ETL_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is least recently used
+                del self._etl_cache[next(iter(self._etl_cache))]
+
             # Clean up old backup files
             self._cleanup_old_files()
 
@@ -128,6 +291,7 @@ class PETDataStore:
             logger.error(f"Error processing file {self.current_file}: {e}")
             return None
 
+    @_locked
     def save_uploaded_file(self, uploaded_file, filename: str) -> bool:
         """
         Save an uploaded file to the data directory
@@ -145,17 +309,21 @@ class PETDataStore:
             # Clean up old uploaded files before saving new one
             self._cleanup_uploaded_files()
 
-            # Read uploaded file content
-            content = uploaded_file.read()
-
             # Write to data directory
-            with open(file_path, 'wb') as f:
-                f.write(content)
+            if hasattr(uploaded_file, 'getbuffer'):
+                # BytesIO-backed uploads expose their buffer directly, which
+                # saves the intermediate bytes copy made by read()
+                with uploaded_file.getbuffer() as content:
+                    _write_file(file_path, content)
+            else:
+                _write_file(file_path, uploaded_file.read())
 
             logger.info(f"Saved uploaded file: {file_path}")
+            self._invalidate_scan()
 
             # Force refresh on next load
-            self.last_modified = None
+            self.last_modified_ns = None
+            self._etl_cache.clear()
 
             return True
 
@@ -166,22 +334,22 @@ class PETDataStore:
     def _cleanup_uploaded_files(self) -> None:
         """Clean up old uploaded files to prevent resource issues"""
         try:
-            uploaded_files = []
-            for file_path in self.data_dir.glob("*.csv"):
-                if "uploaded" in file_path.name and "PET Resource Allocation" in file_path.name:
-                    uploaded_files.append(file_path)
+            uploaded_files = [
+                entry for entry in self._iter_csv_entries()
+                if "uploaded" in entry.name and "PET Resource Allocation" in entry.name
+            ]
 
             # Keep only the most recent 2 uploaded files
             if len(uploaded_files) > 2:
-                uploaded_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+                uploaded_files.sort(key=lambda e: e.stat().st_mtime, reverse=True)
                 files_to_remove = uploaded_files[2:]  # Keep only the 2 most recent
 
-                for file_path in files_to_remove:
-                    try:
-                        file_path.unlink()
-                        logger.info(f"Cleaned up old uploaded file: {file_path}")
-                    except OSError as e:
-                        logger.warning(f"Could not remove old file {file_path}: {e}")
+                _unlink_files(
+                    [Path(entry.path) for entry in files_to_remove],
+                    "Cleaned up old uploaded file"
+                )
+
+                self._invalidate_scan()
 
         except Exception as e:
             logger.warning(f"Error during cleanup: {e}")
@@ -192,27 +360,26 @@ class PETDataStore:
             return
 
         try:
-            matching_files = []
-            for file_path in self.data_dir.glob("*.csv"):
-                if re.search(WATCH_PATTERN, file_path.name, re.IGNORECASE):
-                    mtime = file_path.stat().st_mtime
-                    matching_files.append((file_path, mtime))
+            matching_files = [
+                (Path(path), file_stat.st_mtime) for path, file_stat in self._scan_matching()
+            ]
 
             if len(matching_files) > MAX_BACKUP_FILES:
                 # Sort by modification time, keep newest
                 matching_files.sort(key=lambda x: x[1], reverse=True)
                 files_to_remove = matching_files[MAX_BACKUP_FILES:]
 
-                for file_path, _ in files_to_remove:
-                    try:
-                        file_path.unlink()
-                        logger.info(f"Removed old backup file: {file_path}")
-                    except OSError as e:
-                        logger.warning(f"Could not remove old file {file_path}: {e}")
+                _unlink_files(
+                    [file_path for file_path, _ in files_to_remove],
+                    "Removed old backup file"
+                )
+
+                self._invalidate_scan()
 
         except Exception as e:
             logger.warning(f"Error during cleanup: {e}")
 
+    @_locked
     def get_file_info(self) -> Optional[Dict[str, str]]:
         """
         Get information about the current file
@@ -220,52 +387,59 @@ class PETDataStore:
         Returns:
             Dictionary with file information or None
         """
-        if self.current_file is None or self.last_modified is None:
+        if self.current_file is None or self.last_modified_ns is None:
             return None
 
         return {
             'filename': self.current_file.name,
             'path': str(self.current_file),
-            'last_modified': self.last_modified.strftime('%Y-%m-%d %H:%M:%S'),
+            'last_modified': datetime.fromtimestamp(self.last_modified_ns / 1e9).strftime('%Y-%m-%d %H:%M:%S'),
             'size': f"{self.current_file.stat().st_size / 1024:.1f} KB"
         }
 
-    def get_available_files(self) -> List[Dict[str, str]]:
+    @_locked
+    def get_available_files(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
         """
         Get list of available PET CSV files for manual selection
 
+        Args:
+            limit: Only return the newest ``limit`` files (all files if None)
+
         Returns:
-            List of file info dictionaries
+            List of file info dictionaries, newest first
         """
-        if not self.data_dir.exists():
-            return []
+        matches = self._scan_matching()
 
-        files_info = []
-        for file_path in self.data_dir.glob("*.csv"):
-            if re.search(WATCH_PATTERN, file_path.name, re.IGNORECASE):
-                try:
-                    mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    files_info.append({
-                        'filename': file_path.name,
-                        'path': str(file_path),
-                        'last_modified': mtime.strftime('%Y-%m-%d %H:%M:%S'),
-                        'size': f"{file_path.stat().st_size / 1024:.1f} KB"
-                    })
-                except OSError:
-                    continue
+        mtime_key = lambda m: m[1].st_mtime
+        if limit is None:
+            matches = sorted(matches, key=mtime_key, reverse=True)
+        else:
+            matches = heapq.nlargest(limit, matches, key=mtime_key)
 
-        # Sort by modification time, newest first
-        files_info.sort(key=lambda x: x['last_modified'], reverse=True)
+        # Only the surviving files pay for string formatting
+        files_info = []
+        for path, file_stat in matches:
+            # One stat_result per file supplies both mtime and size
+            files_info.append({
+                'filename': os.path.basename(path),
+                'path': path,
+                'last_modified': datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                'size': f"{file_stat.st_size / 1024:.1f} KB"
+            })
         return files_info
 
 # Global data store instance
 _data_store = None
+_data_store_lock = threading.Lock()
 
 def get_data_store() -> PETDataStore:
     """Get or create global data store instance"""
     global _data_store
     if _data_store is None:
-        _data_store = PETDataStore()
+        # Double-checked so concurrent Streamlit reruns build only one store
+        with _data_store_lock:
+            if _data_store is None:
+                _data_store = PETDataStore()
     return _data_store
 
 def load_latest_data(force_refresh: bool = False):
@@ -0,0 +1,24 @@
+"""
+Streamlit caching helpers shared by the dashboard views
+"""
+
+import streamlit as st
+import pandas as pd
+
+from ..etl import frame_digest
+
+def hash_frame(df: pd.DataFrame) -> tuple:
+    """Byte-level DataFrame fingerprint used as the st.cache_data key"""
+    # The ETL precomputes the hash of goals_df; any other frame is hashed here
+    digest = frame_digest(df)
+    if digest is None:
+        digest = pd.util.hash_pandas_object(df, index=True).values.tobytes()
+    # hash_pandas_object only covers values, so labels and dtypes key separately
+    return (df.shape, tuple(df.columns), tuple(map(str, df.dtypes)), digest)
+
+# Cache decorator for pure computations that depend only on their input frames
+cache_frame = st.cache_data(
+    show_spinner=False,
+    max_entries=8,
+    hash_funcs={pd.DataFrame: hash_frame}
+)
@@ -4,10 +4,161 @@ Goal-focused dashboard views for workstream-goal mapping analysis
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import re
+from difflib import SequenceMatcher
 from typing import Optional, List, Dict, Any
 
+from .caching import cache_frame
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except ImportError:
+    # Fall back to difflib when RapidFuzz is not installed
+    _rf_fuzz = _rf_process = None
+
+# Common workstream name prefixes, tried in order (longest "SBG" variant first)
+_WS_PREFIX_RE = re.compile(r'^(?:SBG PD \| |SBG \| |GBSG |PDX \| |Mailchimp \| )')
+_MULTI_SPACE_RE = re.compile(r'  +')
+
+# Source column for each "Show in cells" option of the goal pivot
+_PIVOT_VALUE_COLUMNS = {
+    "Allocation %": 'Allocation %',
+    "Active Status": 'Active',
+    "Benefit L2": 'Benefit L2'
+}
+
+# Pivots above this many rows go through Polars when it is installed;
+# smaller ones stay on pandas to skip the conversion overhead (and the import)
+POLARS_PIVOT_MIN_ROWS = 50_000
+
+# st.fragment needs Streamlit >= 1.37; older versions rerun the whole script
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+@cache_frame
+def _ws_to_fte(goals_df: pd.DataFrame) -> pd.Series:
+    """Target FTE per workstream (first value, since it repeats on every goal row)"""
+    return goals_df.groupby('Workstream Name', observed=True)['Target FTE Headcount'].first()
+
+def _pivot_goals(pivot_source: pd.DataFrame, values_col: str) -> pd.DataFrame:
+    """Reshape deduplicated (workstream, goal, value) rows into a workstream x goal matrix"""
+    polars = None
+    if len(pivot_source) > POLARS_PIVOT_MIN_ROWS:
+        try:
+            import polars
+        except ImportError:
+            pass  # Optional: fall back to the pandas pivot
+
+    if polars is None:
+        pivot_table = pivot_source.pivot(index='Workstream Name', columns='Goal Name', values=values_col)
+    else:
+        pivot_table = polars.from_pandas(pivot_source).pivot(
+            index='Workstream Name', on='Goal Name', values=values_col, aggregate_function='first'
+        ).to_pandas().set_index('Workstream Name')
+        # Restore the categorical axes Polars drops, so both paths sort alike
+        pivot_table = pivot_table.reindex(
+            index=pd.Index(pivot_source['Workstream Name'].unique(), name='Workstream Name'),
+            columns=pd.Index(pivot_source['Goal Name'].unique(), name='Goal Name')
+        )
+
+    # Both pivots keep first-seen order; sort the axes like the pivot_table they replaced
+    return pivot_table.sort_index().sort_index(axis=1)
+
+def _unique_fte(goals_df: pd.DataFrame, subset_df: pd.DataFrame) -> float:
+    """Sum Target FTE over the workstreams in subset_df without double counting"""
+    return _ws_to_fte(goals_df).loc[subset_df['Workstream Name'].unique().tolist()].sum()
+
+@cache_frame
+def _filter_options(goals_df: pd.DataFrame) -> Dict[str, tuple]:
+    """Option lists for the goal detail multiselects (categories are already sorted)"""
+    return {
+        'l4': tuple(goals_df['L4 Leaders'].cat.categories),
+        'benefit': tuple(goals_df['Benefit L2'].cat.categories),
+        'workstream': tuple(goals_df['Workstream Name'].cat.categories)
+    }
+
+@cache_frame
+def _overview_metrics(goals_df: pd.DataFrame) -> tuple:
+    """Compute (workstreams, goals, avg allocation, unique FTE) KPIs"""
+    total_workstreams = goals_df['Workstream Name'].nunique()
+    total_goals = goals_df['Goal Name'].nunique()
+    avg_allocation = goals_df['Allocation %'].mean()
+    # Calculate unique FTE by workstream to avoid double counting
+    unique_fte_by_workstream = _ws_to_fte(goals_df).sum()
+    return total_workstreams, total_goals, avg_allocation, unique_fte_by_workstream
+
+@cache_frame
+def _workstream_summary(goals_df: pd.DataFrame) -> pd.DataFrame:
+    """Target FTE, goal count and max goal allocation per workstream"""
+    # Group by workstream - show FTE and goal count, not allocation sum
+    # as_index=False emits the workstream column directly, skipping a reset_index copy
+    workstream_allocation = goals_df.groupby('Workstream Name', as_index=False, sort=False, observed=True).agg(**{
+        'Target FTE': ('Target FTE Headcount', 'first'),
+        'Goal Count': ('Goal Name', 'size'),
+        'Max Goal Allocation %': ('Allocation %', 'max')
+    })
+    return workstream_allocation.sort_values('Target FTE', ascending=True)
+
+@cache_frame
+def _benefit_allocation(goals_df: pd.DataFrame) -> pd.DataFrame:
+    """Total goal allocation per benefit type, largest first"""
+    benefit_allocation = goals_df.groupby('Benefit L2', observed=True)['Allocation %'].sum().reset_index()
+    return benefit_allocation.sort_values('Allocation %', ascending=False)
+
+@cache_frame
+def _leader_summary(goals_df: pd.DataFrame) -> pd.DataFrame:
+    """Workstream, goal, allocation and unique FTE metrics per L4 leader"""
+    # Calculate proper metrics without summing allocation percentages
+    by_leader = goals_df.groupby('L4 Leaders', sort=False, observed=True)
+    # Calculate unique FTE by summing unique FTE per workstream
+    unique_fte = (
+        goals_df.groupby(['L4 Leaders', 'Workstream Name'], sort=False, observed=True)['Target FTE Headcount']
+        .first()
+        .groupby(level='L4 Leaders', sort=False, observed=True)
+        .sum()
+    )
+    # Assemble every column in one constructor rather than growing the frame
+    leader_summary = pd.DataFrame({
+        'Workstreams': by_leader['Workstream Name'].nunique(),
+        'Goals': by_leader['Goal Name'].nunique(),
+        'Avg Allocation %': by_leader['Allocation %'].mean(),
+        'Total FTE (Unique)': unique_fte
+    }).rename_axis('L4 Leaders').reset_index()
+    return leader_summary.sort_values('Total FTE (Unique)', ascending=False)
+
+@cache_frame
+def _drill_agg(goals_df: pd.DataFrame, group_col: str) -> pd.DataFrame:
+    """Drilldown metrics per group_col value, sorted by allocation"""
+    if group_col == 'L4 Leaders':
+        # For L4 Leaders, calculate average allocation percentage (not sum)
+        # and sum unique FTE from workstreams to avoid double counting
+        # (back in first-seen leader order, so ties sort as before)
+        agg_df = _leader_summary(goals_df).sort_index().rename(columns={
+            'Workstreams': 'Unique Workstreams',
+            'Goals': 'Unique Goals',
+            'Total FTE (Unique)': 'Total FTE'
+        })
+        sort_col = 'Avg Allocation %'
+    else:
+        # For other levels, sum makes more sense. Named aggregations keep the
+        # group column from clashing with its own nunique on reset_index
+        agg_df = goals_df.groupby(group_col, observed=True).agg(**{
+            'Total Allocation %': ('Allocation %', 'sum'),
+            'Total FTE': ('Target FTE Headcount', 'sum'),
+            'Unique Goals': ('Goal Name', 'nunique'),
+            'Unique Workstreams': ('Workstream Name', 'nunique')
+        }).reset_index()
+        sort_col = 'Total Allocation %'
+    # Sort by the appropriate allocation column
+    return agg_df.sort_values(sort_col, ascending=False, kind='stable')
+
+@cache_frame
+def _drill_detail(goals_df: pd.DataFrame, group_col: str, selected_item: str) -> pd.DataFrame:
+    """Goal rows belonging to one drilldown group"""
+    return goals_df[goals_df[group_col] == selected_item]
+
 def create_goal_overview(goals_df: pd.DataFrame) -> None:
     """Create overview dashboard for workstream-goal mappings"""
     if goals_df.empty:
@@ -17,23 +168,19 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
     st.header("🎯 Workstream-Goal Mapping Overview")
     
     # Summary metrics
+    total_workstreams, total_goals, avg_allocation, unique_fte_by_workstream = _overview_metrics(goals_df)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_workstreams = goals_df['Workstream Name'].nunique()
         st.metric("Total Workstreams", total_workstreams)
     
     with col2:
-        total_goals = goals_df['Goal Name'].nunique()
         st.metric("Total Goals", total_goals)
     
     with col3:
-        avg_allocation = goals_df['Allocation %'].mean()
         st.metric("Avg Goal Allocation", f"{avg_allocation:.1f}%")
     
     with col4:
-        # Calculate unique FTE by workstream to avoid double counting
-        unique_fte_by_workstream = goals_df.groupby('Workstream Name')['Target FTE Headcount'].first().sum()
         st.metric("Total Target FTE (Unique)", f"{unique_fte_by_workstream:.0f}")
     
     st.divider()
@@ -43,22 +190,7 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
     
     with col1:
         st.subheader("FTE and Goal Count by Workstream")
-        # Group by workstream - show FTE and goal count, not allocation sum
-        workstream_summary = []
-        for workstream in goals_df['Workstream Name'].unique():
-            ws_data = goals_df[goals_df['Workstream Name'] == workstream]
-            unique_fte = ws_data['Target FTE Headcount'].iloc[0] if len(ws_data) > 0 else 0
-            goal_count = len(ws_data)
-            max_allocation = ws_data['Allocation %'].max() if len(ws_data) > 0 else 0
-            workstream_summary.append({
-                'Workstream Name': workstream,
-                'Target FTE': unique_fte,
-                'Goal Count': goal_count,
-                'Max Goal Allocation %': max_allocation
-            })
-        
-        workstream_allocation = pd.DataFrame(workstream_summary)
-        workstream_allocation = workstream_allocation.sort_values('Target FTE', ascending=True)
+        workstream_allocation = _workstream_summary(goals_df)
         
         fig = px.bar(
             workstream_allocation,
@@ -74,8 +206,7 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
     
     with col2:
         st.subheader("Allocation by Benefit Type")
-        benefit_allocation = goals_df.groupby('Benefit L2')['Allocation %'].sum().reset_index()
-        benefit_allocation = benefit_allocation.sort_values('Allocation %', ascending=False)
+        benefit_allocation = _benefit_allocation(goals_df)
         
         fig = px.pie(
             benefit_allocation,
@@ -86,29 +217,40 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
         st.plotly_chart(fig, width='stretch')
     
     # Goal details table
+    _goal_filters_and_pivot(goals_df)
+
+@_fragment
+def _goal_filters_and_pivot(goals_df: pd.DataFrame) -> None:
+    """
+    Goal detail filters, pivot matrix and filtered summaries
+
+    Runs as a fragment so changing these widgets reruns only this block,
+    not the overview charts above it.
+    """
     st.subheader("Goal Details")
     
     # Add filters - now with 5 columns
+    filter_options = _filter_options(goals_df)
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
         selected_l4_leaders = st.multiselect(
             "Filter by L4 Leaders",
-            options=sorted(goals_df['L4 Leaders'].dropna().unique()),
+            options=filter_options['l4'],
             key="goal_l4_filter"
         )
     
     with col2:
         selected_benefit = st.multiselect(
             "Filter by Benefit Type",
-            options=sorted(goals_df['Benefit L2'].dropna().unique()),
+            options=filter_options['benefit'],
             key="goal_benefit_filter"
         )
     
     with col3:
         selected_workstreams = st.multiselect(
             "Filter by Workstream",
-            options=sorted(goals_df['Workstream Name'].dropna().unique()),
+            options=filter_options['workstream'],
             key="goal_workstream_filter"
         )
     
@@ -125,26 +267,27 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
     with col5:
         active_only = st.checkbox("Active Goals Only", value=True, key="goal_active_filter")
     
-    # Apply filters
-    filtered_df = goals_df.copy()
+    # Apply filters as one fused boolean mask, then index once
+    mask = np.ones(len(goals_df), dtype=bool)
     
     if selected_l4_leaders:
-        filtered_df = filtered_df[filtered_df['L4 Leaders'].isin(selected_l4_leaders)]
+        np.logical_and(mask, goals_df['L4 Leaders'].isin(selected_l4_leaders).to_numpy(), out=mask)
     
     if selected_benefit:
-        filtered_df = filtered_df[filtered_df['Benefit L2'].isin(selected_benefit)]
+        np.logical_and(mask, goals_df['Benefit L2'].isin(selected_benefit).to_numpy(), out=mask)
     
     if selected_workstreams:
-        filtered_df = filtered_df[filtered_df['Workstream Name'].isin(selected_workstreams)]
+        np.logical_and(mask, goals_df['Workstream Name'].isin(selected_workstreams).to_numpy(), out=mask)
     
     if allocation_range != (0, 100):
-        filtered_df = filtered_df[
-            (filtered_df['Allocation %'] >= allocation_range[0]) & 
-            (filtered_df['Allocation %'] <= allocation_range[1])
-        ]
+        alloc = goals_df['Allocation %'].to_numpy()
+        np.logical_and(mask, (alloc >= allocation_range[0]) & (alloc <= allocation_range[1]), out=mask)
     
     if active_only:
-        filtered_df = filtered_df[filtered_df['Active'] == True]
+        np.logical_and(mask, goals_df['Active'].to_numpy(dtype=bool), out=mask)
+    
+    # Nothing below mutates filtered_df, so an all-pass mask reuses goals_df as is
+    filtered_df = goals_df if mask.all() else goals_df.iloc[mask]
     
     # Create TRUE pivot table - matrix view of workstreams vs goals
     st.subheader("Workstream-Goal Matrix (True Pivot Table)")
@@ -169,65 +312,58 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
                 key="max_goals_slider"
             )
         
-        # Get top goals by frequency across workstreams
-        top_goals = filtered_df['Goal Name'].value_counts().head(max_goals).index.tolist()
+        # Get top goals by frequency across workstreams; a partial top-k
+        # avoids sorting every goal's count (a bincount for categoricals)
+        goal_counts = filtered_df['Goal Name'].value_counts(sort=False)
+        # Categorical counts include unused categories; keep only goals present
+        goal_counts = goal_counts[goal_counts > 0]
+        top_goals = goal_counts.nlargest(max_goals, keep='first').index.tolist()
         pivot_filtered = filtered_df[filtered_df['Goal Name'].isin(top_goals)]
         
         if not pivot_filtered.empty:
-            # Create the actual pivot table
+            # Create the actual pivot table. There should be one value per
+            # workstream-goal pair, so a plain reshape replaces pivot_table's
+            # groupby; duplicates keep the first value as aggfunc='first' did
+            values_col = _PIVOT_VALUE_COLUMNS[pivot_value]
+            pivot_source = pivot_filtered[['Workstream Name', 'Goal Name', values_col]].drop_duplicates(
+                subset=['Workstream Name', 'Goal Name']
+            )
+            if values_col == 'Benefit L2':
+                # Categorical values cannot be filled with "", so pivot the plain strings
+                pivot_source = pivot_source.astype({values_col: object})
+            pivot_table = _pivot_goals(pivot_source, values_col)
+            
             if pivot_value == "Allocation %":
-                pivot_table = pivot_filtered.pivot_table(
-                    index='Workstream Name',
-                    columns='Goal Name', 
-                    values='Allocation %',
-                    aggfunc='first',  # Use first since there should be one value per workstream-goal pair
-                    fill_value=0
-                )
+                pivot_table = pivot_table.fillna(0)
                 # Format as percentages
                 pivot_display = pivot_table.round(1)
-                
             elif pivot_value == "Active Status":
-                pivot_table = pivot_filtered.pivot_table(
-                    index='Workstream Name',
-                    columns='Goal Name',
-                    values='Active',
-                    aggfunc='first',
-                    fill_value=False
+                # Convert to readable format in one pass; missing pairs count as inactive
+                active = np.equal(pivot_table.to_numpy(), True)
+                pivot_display = pd.DataFrame(
+                    np.where(active, "✅", "❌"), index=pivot_table.index, columns=pivot_table.columns
                 )
-                # Convert to readable format
-                pivot_display = pivot_table.replace({True: "✅", False: "❌", 0: ""})
-                
             else:  # Benefit L2
-                pivot_table = pivot_filtered.pivot_table(
-                    index='Workstream Name',
-                    columns='Goal Name',
-                    values='Benefit L2',
-                    aggfunc='first',
-                    fill_value=""
-                )
+                pivot_table = pivot_table.fillna("")
                 pivot_display = pivot_table
             
-            # Add workstream summary columns
-            ws_summary = []
-            for ws in pivot_table.index:
-                ws_data = filtered_df[filtered_df['Workstream Name'] == ws]
-                fte = ws_data['Target FTE Headcount'].iloc[0] if len(ws_data) > 0 else 0
-                goal_count = len(ws_data)
-                leader = ws_data['L4 Leaders'].iloc[0] if len(ws_data) > 0 else ''
-                
-                ws_summary.append({
-                    'FTE': fte,
-                    'Goals': goal_count,
-                    'L4 Leader': leader
-                })
-            
-            summary_df = pd.DataFrame(ws_summary, index=pivot_table.index)
-            
-            # Combine pivot table with summary
-            combined_table = pd.concat([summary_df, pivot_display], axis=1)
+            # Add workstream summary columns in front of the pivot in place,
+            # instead of concatenating a separate summary frame
+            # Every pivot row comes from filtered_df, so one aggregation plus
+            # a single reindex covers all of them without per-row guards
+            ws_summary = filtered_df.groupby('Workstream Name', observed=True, sort=False).agg(**{
+                'FTE': ('Target FTE Headcount', 'first'),
+                'Goals': ('Goal Name', 'size'),
+                'L4 Leader': ('L4 Leaders', 'first'),
+            }).reindex(pivot_table.index)
+            combined_table = pivot_display.copy()
+            # Goal columns come back as a CategoricalIndex; plain labels accept new names
+            combined_table.columns = combined_table.columns.astype(object)
+            for summary_col in ('L4 Leader', 'Goals', 'FTE'):
+                combined_table.insert(0, summary_col, ws_summary[summary_col], allow_duplicates=True)
             
             st.write(f"**Showing {pivot_value} for workstreams vs top {len(top_goals)} goals**")
-            st.dataframe(combined_table, width='stretch')
+            st.dataframe(combined_table.reset_index(), width='stretch', hide_index=True)
             
             # Show legend for the pivot table
             if pivot_value == "Allocation %":
@@ -249,11 +385,11 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
             st.metric("Total Workstream-Goal Combinations", total_combinations)
         
         with col2:
-            avg_goals_per_ws = filtered_df.groupby('Workstream Name').size().mean()
+            avg_goals_per_ws = filtered_df.groupby('Workstream Name', observed=True).size().mean()
             st.metric("Avg Goals per Workstream", f"{avg_goals_per_ws:.1f}")
         
         with col3:
-            avg_ws_per_goal = filtered_df.groupby('Goal Name').size().mean()
+            avg_ws_per_goal = filtered_df.groupby('Goal Name', observed=True).size().mean()
             st.metric("Avg Workstreams per Goal", f"{avg_ws_per_goal:.1f}")
         
         # Additional summary metrics for filtered data
@@ -271,7 +407,7 @@ def create_goal_overview(goals_df: pd.DataFrame) -> None:
             st.metric("Avg Goal Allocation %", f"{avg_allocation:.1f}%")
         with col4:
             # Calculate unique FTE across all workstreams (no double counting)
-            unique_total_fte = filtered_df.groupby('Workstream Name')['Target FTE Headcount'].first().sum()
+            unique_total_fte = _unique_fte(goals_df, filtered_df)
             st.metric("Total Target FTE", f"{unique_total_fte:.0f}")
     
     else:
@@ -319,41 +455,9 @@ def create_goal_drilldown(goals_df: pd.DataFrame) -> None:
         group_col = 'Benefit L2'
         title_suffix = "by Benefit Type"
     
-    # Calculate metrics by selected level
-    if drill_level == "L4 Leaders":
-        # For L4 Leaders, calculate average allocation percentage (not sum)
-        # and sum unique FTE from workstreams to avoid double counting
-        # For L4 Leaders, calculate metrics differently to avoid double counting
-        leader_metrics = []
-        for leader in goals_df[group_col].unique():
-            leader_data = goals_df[goals_df[group_col] == leader]
-            # Get unique FTE per workstream to avoid double counting
-            unique_fte = leader_data.groupby('Workstream Name')['Target FTE Headcount'].first().sum()
-            avg_allocation = leader_data['Allocation %'].mean()
-            unique_goals = leader_data['Goal Name'].nunique()
-            unique_workstreams = leader_data['Workstream Name'].nunique()
-            
-            leader_metrics.append({
-                group_col: leader,
-                'Avg Allocation %': avg_allocation,
-                'Total FTE': unique_fte,
-                'Unique Goals': unique_goals,
-                'Unique Workstreams': unique_workstreams
-            })
-        
-        agg_df = pd.DataFrame(leader_metrics)
-    else:
-        # For other levels, sum makes more sense
-        agg_df = goals_df.groupby(group_col).agg({
-            'Allocation %': 'sum',
-            'Target FTE Headcount': 'sum',
-            'Goal Name': 'nunique',
-            'Workstream Name': 'nunique'
-        }).reset_index()
-        agg_df.columns = [group_col, 'Total Allocation %', 'Total FTE', 'Unique Goals', 'Unique Workstreams']
-    # Sort by the appropriate allocation column
-    sort_col = 'Avg Allocation %' if drill_level == "L4 Leaders" else 'Total Allocation %'
-    agg_df = agg_df.sort_values(sort_col, ascending=False)
+    # Calculate metrics by selected level (cached per level, so changing
+    # the detail selection below does not recompute them)
+    agg_df = _drill_agg(goals_df, group_col)
     
     # Create visualizations
     col1, col2 = st.columns(2)
@@ -397,7 +501,7 @@ def create_goal_drilldown(goals_df: pd.DataFrame) -> None:
     )
     
     if selected_item:
-        detailed_df = goals_df[goals_df[group_col] == selected_item]
+        detailed_df = _drill_detail(goals_df, group_col, selected_item)
         
         col1, col2 = st.columns(2)
         
@@ -417,7 +521,7 @@ def create_goal_drilldown(goals_df: pd.DataFrame) -> None:
             # Calculate appropriate FTE metric based on drill level
             if drill_level == "L4 Leaders":
                 # For L4 Leaders, get unique FTE per workstream to avoid double counting
-                unique_fte = detailed_df.groupby('Workstream Name')['Target FTE Headcount'].first().sum()
+                unique_fte = _unique_fte(goals_df, detailed_df)
                 st.metric("Total Target FTE (Unique)", f"{unique_fte:.0f}")
             else:
                 # For other levels, sum makes sense
@@ -442,36 +546,18 @@ def normalize_workstream_name(name: str) -> str:
     if not name or not isinstance(name, str):
         return ""
     
-    # Remove common prefixes
-    prefixes_to_remove = [
-        "SBG PD | ",
-        "SBG | ",
-        "GBSG ",
-        "PDX | ",
-        "Mailchimp | "
-    ]
-    
-    normalized = name.strip()
-    for prefix in prefixes_to_remove:
-        if normalized.startswith(prefix):
-            normalized = normalized[len(prefix):].strip()
-            break
-    
-    # Additional cleanup
-    normalized = normalized.replace("  ", " ").strip()
-    return normalized
+    # Remove common prefix, then collapse repeated spaces
+    normalized = _WS_PREFIX_RE.sub('', name.strip(), count=1)
+    return _MULTI_SPACE_RE.sub(' ', normalized).strip()
 
-def fuzzy_match_workstreams(people_workstreams: set, goal_workstreams: set) -> dict:
+@st.cache_data(show_spinner=False)
+def fuzzy_match_workstreams(people_workstreams: tuple, goal_workstreams: tuple) -> dict:
     """
     Create fuzzy matches between people and goal workstreams.
     Returns a dictionary mapping people workstream names to goal workstream names.
+
+    Takes sorted tuples so the result can be memoized by st.cache_data.
     """
-    try:
-        from difflib import SequenceMatcher
-    except ImportError:
-        # Fallback to simple string matching if difflib not available
-        return {}
-    
     matches = {}
     
     # First pass: exact matches after normalization
@@ -486,31 +572,58 @@ def fuzzy_match_workstreams(people_workstreams: set, goal_workstreams: set) -> d
             matches[people_ws] = goal_norm_to_original[people_norm]
     
     # Second pass: fuzzy matching for unmatched workstreams
-    unmatched_people = set(people_workstreams) - set(matches.keys())
-    unmatched_goals = set(goal_workstreams) - set(matches.values())
+    # Lowercase once up front rather than per comparison
+    matched_goals = set(matches.values())
+    unmatched_goals = {
+        ws: norm.lower() for ws, norm in goal_normalized.items() if ws not in matched_goals
+    }
+    unmatched_people = [ws for ws in people_workstreams if ws not in matches]
+    
+    score_matrix = None
+    if _rf_process is not None and unmatched_people and unmatched_goals:
+        # Score every remaining pair in one parallel C++ call (0-100, below 70 comes back as 0)
+        goal_keys = list(unmatched_goals)
+        goal_pos = {ws: j for j, ws in enumerate(goal_keys)}
+        score_matrix = _rf_process.cdist(
+            [people_normalized[ws].lower() for ws in unmatched_people],
+            [unmatched_goals[ws] for ws in goal_keys],
+            scorer=_rf_fuzz.ratio,
+            score_cutoff=70,
+            workers=-1
+        )
+        available = np.ones(len(goal_keys), dtype=bool)
     
-    for people_ws in unmatched_people:
-        people_norm = people_normalized[people_ws]
+    for i, people_ws in enumerate(unmatched_people):
+        people_norm = people_normalized[people_ws].lower()
         best_match = None
         best_score = 0.0
         
-        for goal_ws in unmatched_goals:
-            goal_norm = goal_normalized[goal_ws]
-            
-            # Use sequence matcher for similarity
-            score = SequenceMatcher(None, people_norm.lower(), goal_norm.lower()).ratio()
-            
-            # Boost score if one contains the other
-            if people_norm.lower() in goal_norm.lower() or goal_norm.lower() in people_norm.lower():
-                score = max(score, 0.8)
-            
-            if score > best_score and score >= 0.7:  # Minimum threshold for fuzzy match
-                best_score = score
-                best_match = goal_ws
+        if score_matrix is not None:
+            # Best remaining goal; argmax keeps the first on ties
+            row = np.where(available, score_matrix[i], 0)
+            j = int(row.argmax())
+            if row[j] >= 70:  # Minimum threshold for fuzzy match
+                best_match, best_score = goal_keys[j], row[j] / 100.0
+        else:
+            for goal_ws, goal_norm in unmatched_goals.items():
+                # Use sequence matcher for similarity
+                score = SequenceMatcher(None, people_norm, goal_norm).ratio()
+                if score > best_score and score >= 0.7:  # Minimum threshold for fuzzy match
+                    best_score = score
+                    best_match = goal_ws
+        
+        # Boost score if one contains the other
+        if best_score < 0.8:
+            for goal_ws, goal_norm in unmatched_goals.items():
+                if people_norm in goal_norm or goal_norm in people_norm:
+                    best_match = goal_ws
+                    break
         
         if best_match:
             matches[people_ws] = best_match
-            unmatched_goals.remove(best_match)
+            del unmatched_goals[best_match]
+            if score_matrix is not None:
+                available[goal_pos[best_match]] = False
     
     return matches
 
@@ -528,22 +641,29 @@ def create_integrated_view(goals_df: pd.DataFrame, people_df: Optional[pd.DataFr
         st.subheader("Workstream Matching Analysis")
         st.info("🔗 Using fuzzy matching to bridge workstream name differences between datasets")
         
+        # Positions of the workstream columns; iloc by position avoids duplicate column name issues
+        ws_col_idx = [
+            col_idx for col_idx, col in enumerate(people_df.columns)
+            if 'Workstream Display Name' in str(col)
+        ]
+        
         # Extract workstream names from people_df (from workstream columns)
         people_workstreams = set()
-        for col_idx, col in enumerate(people_df.columns):
-            if 'Workstream Display Name' in str(col):
-                # Use iloc to access by position to avoid duplicate column name issues
-                series = people_df.iloc[:, col_idx].dropna()
-                ws_names = series.unique()
-                # Filter out empty strings and null values
-                ws_names = [name for name in ws_names if name and str(name).strip() != '']
-                people_workstreams.update(ws_names)
+        for col_idx in ws_col_idx:
+            series = people_df.iloc[:, col_idx].dropna()
+            ws_names = series.unique()
+            # Filter out empty strings and null values
+            ws_names = [name for name in ws_names if name and str(name).strip() != '']
+            people_workstreams.update(ws_names)
         
         # Extract workstream names from goals_df
         goal_workstreams = set(goals_df['Workstream Name'].dropna().unique())
         
         # Create fuzzy matches
-        fuzzy_matches = fuzzy_match_workstreams(people_workstreams, goal_workstreams)
+        fuzzy_matches = fuzzy_match_workstreams(
+            tuple(sorted(people_workstreams, key=str)),
+            tuple(sorted(goal_workstreams, key=str))
+        )
         
         # Find exact matches (for backward compatibility)
         exact_matches = people_workstreams.intersection(goal_workstreams)
@@ -616,10 +736,10 @@ def create_integrated_view(goals_df: pd.DataFrame, people_df: Optional[pd.DataFr
                 # Resource allocation information
                 st.write("**Resource Allocation Information:**")
                 
-                # Find people assigned to this workstream
-                workstream_people = people_df[
-                    people_df.apply(lambda row: selected_workstream in str(row.values), axis=1)
-                ]
+                # Find people assigned to this workstream with one vectorized
+                # compare over the workstream columns instead of a per-row apply
+                ws_values = people_df.iloc[:, ws_col_idx].astype(str).to_numpy()
+                workstream_people = people_df[(ws_values == selected_workstream).any(axis=1)]
                 
                 if not workstream_people.empty:
                     # Use the correct column names after ETL processing
@@ -646,26 +766,7 @@ def create_integrated_view(goals_df: pd.DataFrame, people_df: Optional[pd.DataFr
     # Standalone goal analysis
     st.subheader("Goal Summary by L4 Leaders")
     
-    # Calculate proper metrics without summing allocation percentages
-    leader_summary = []
-    for leader in goals_df['L4 Leaders'].unique():
-        leader_data = goals_df[goals_df['L4 Leaders'] == leader]
-        unique_workstreams = leader_data['Workstream Name'].nunique()
-        total_goals = leader_data['Goal Name'].nunique()
-        # Calculate unique FTE by summing unique FTE per workstream
-        unique_fte_per_ws = leader_data.groupby('Workstream Name')['Target FTE Headcount'].first().sum()
-        avg_allocation = leader_data['Allocation %'].mean()
-        
-        leader_summary.append({
-            'L4 Leaders': leader,
-            'Workstreams': unique_workstreams,
-            'Goals': total_goals,
-            'Avg Allocation %': avg_allocation,
-            'Total FTE (Unique)': unique_fte_per_ws
-        })
-    
-    leader_summary = pd.DataFrame(leader_summary)
-    leader_summary = leader_summary.sort_values('Total FTE (Unique)', ascending=False)
+    leader_summary = _leader_summary(goals_df)
     
     st.dataframe(leader_summary, width='stretch', hide_index=True)
     
@@ -682,7 +783,7 @@ def create_integrated_view(goals_df: pd.DataFrame, people_df: Optional[pd.DataFr
         with col1:
             st.subheader("Workstream Distribution by L4 Leaders")
             # Aggregate by L4 Leaders and Workstream
-            ws_by_leader = viz_df.groupby(['L4 Leaders', 'Workstream Name']).agg({
+            ws_by_leader = viz_df.groupby(['L4 Leaders', 'Workstream Name'], observed=True).agg({
                 'Target FTE Headcount': 'first',
                 'Allocation %': 'mean',
                 'Goal Name': 'nunique'
@@ -703,7 +804,7 @@ def create_integrated_view(goals_df: pd.DataFrame, people_df: Optional[pd.DataFr
         with col2:
             st.subheader("Goal Allocation Overview")
             # Create scatter plot showing FTE vs Allocation
-            goal_scatter = viz_df.groupby(['L4 Leaders', 'Goal Name']).agg({
+            goal_scatter = viz_df.groupby(['L4 Leaders', 'Goal Name'], observed=True).agg({
                 'Target FTE Headcount': 'first',
                 'Allocation %': 'first',
                 'Workstream Name': 'first'
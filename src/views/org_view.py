@@ -5,8 +5,53 @@ Displays resources in table/tree format with drill-down capabilities
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import functools
 from typing import Dict, Any, Optional
-import json
+
+from .caching import cache_frame
+from ..components.pagination import paginate
+
+# Row count above which org path totals are aggregated with Numba, if installed
+NUMBA_TREE_MIN_ROWS = 100_000
+
+def _sum_path_keys(keys, pct):
+    """Row count and allocation total per packed path key, in first-seen order"""
+    slots = dict()
+    uniq = np.empty(keys.size, dtype=np.int64)
+    counts = np.zeros(keys.size, dtype=np.int64)
+    sums = np.zeros(keys.size, dtype=np.float64)
+    n = 0
+    for i in range(keys.size):
+        key = keys[i]
+        if key in slots:
+            slot = slots[key]
+        else:
+            slot = n
+            slots[key] = slot
+            uniq[slot] = key
+            n += 1
+        counts[slot] += 1
+        sums[slot] += pct[i]
+    return uniq[:n], counts[:n], sums[:n]
+
+@functools.lru_cache(maxsize=1)
+def _path_key_kernel():
+    """_sum_path_keys compiled with Numba, or None when Numba is not installed"""
+    # Imported on first use so app start doesn't pay for Numba
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_sum_path_keys)
+
+# Person flag columns and the status label shown when each is set
+_STATUS_MAP = (
+    ('overallocated', "🔴 Overallocated"),
+    ('underallocated', "🟡 Underallocated"),
+    ('unassigned', "⚪ Unassigned"),
+    ('allocation_mismatch', "⚠️ Allocation Mismatch"),
+)
 
 def create_org_view(people_df: pd.DataFrame, assignments_df: pd.DataFrame) -> None:
     """
@@ -53,11 +98,7 @@ def create_org_table_view(people_df: pd.DataFrame, assignments_df: pd.DataFrame)
 
     # Filter to available columns
     available_cols = [col for col in display_cols if col in people_df.columns]
-    display_df = people_df[available_cols].copy()
-
-    # Format columns
-    if 'total_allocation_pct' in display_df.columns:
-        display_df['total_allocation_pct'] = display_df['total_allocation_pct'].round(1)
+    display_df = people_df[available_cols]
 
     # Rename columns for display
     column_names = {
@@ -77,9 +118,9 @@ def create_org_table_view(people_df: pd.DataFrame, assignments_df: pd.DataFrame)
     # Add selection column for drill-down
     display_df.insert(0, 'Select', False)
 
-    # Display table with selection
+    # Display one page of the table with selection
     edited_df = st.data_editor(
-        display_df,
+        paginate(display_df, key="org_table_page"),
         column_config={
             "Select": st.column_config.CheckboxColumn(
                 "Select",
@@ -137,18 +178,24 @@ def create_org_tree_view(people_df: pd.DataFrame, assignments_df: pd.DataFrame)
         return
 
     # Create tree structure
-    tree_data = build_org_tree(people_df, available_levels)
+    tree_data = _cached_org_tree(people_df, tuple(available_levels), assignments_df)
 
     # Display tree
     display_org_tree(tree_data, people_df, assignments_df)
 
-def build_org_tree(people_df: pd.DataFrame, hierarchy_levels: list) -> Dict[str, Any]:
+@cache_frame
+def _cached_org_tree(people_df: pd.DataFrame, hierarchy_levels: tuple, assignments_df: pd.DataFrame) -> Dict[str, Any]:
+    """Org tree for the given levels, rebuilt only when the input frames change"""
+    return build_org_tree(people_df, list(hierarchy_levels), index_person_workstreams(assignments_df))
+
+def build_org_tree(people_df: pd.DataFrame, hierarchy_levels: list, ws_by_emp: Dict[Any, list]) -> Dict[str, Any]:
     """
     Build hierarchical tree structure from people data
 
     Args:
         people_df: People DataFrame
         hierarchy_levels: List of hierarchy levels to include
+        ws_by_emp: Workstream assignments per employee ID, from index_person_workstreams
 
     Returns:
         Nested dictionary representing the org tree
@@ -156,58 +203,118 @@ def build_org_tree(people_df: pd.DataFrame, hierarchy_levels: list) -> Dict[str,
 
     tree = {}
 
-    for _, person in people_df.iterrows():
-        current_node = tree
+    paths = people_df[hierarchy_levels].apply(_fill_unknown)
+    pct = people_df['total_allocation_pct'] if 'total_allocation_pct' in people_df.columns else 0
+
+    # Resource count and FTE for every distinct org path in one grouped pass
+    path_totals = _numba_path_totals(paths, pct) if len(paths) > NUMBA_TREE_MIN_ROWS else None
+    if path_totals is None:
+        path_totals = paths.assign(_pct=pct).groupby(hierarchy_levels, sort=False, observed=True).agg(
+            _count=('_pct', 'size'),
+            _fte=('_pct', 'sum')
+        )
 
-        # Navigate/create path through hierarchy
-        for level in hierarchy_levels:
-            level_value = person.get(level, 'Unknown')
-            if pd.isna(level_value):
-                level_value = '(unknown)'
+    # Create each path once, adding its totals to every node on the way down
+    leaf_nodes = {}
+    for path, count, fte in path_totals.itertuples(name=None):
+        if not isinstance(path, tuple):
+            path = (path,)  # a single hierarchy level groups on a flat index
 
+        current_node = tree
+        for level_value in path:
             if level_value not in current_node:
                 current_node[level_value] = {'_count': 0, '_fte': 0.0}
 
             current_node = current_node[level_value]
-
-        # Add person at leaf level
-        emp_id = person.get('employee_id', person.get('resource_name', 'Unknown'))
-        current_node[emp_id] = {
-            'name': person.get('resource_name', 'Unknown'),
-            'type': person.get('type', 'Unknown'),
-            'allocation_pct': person.get('total_allocation_pct', 0),
-            'workstreams': get_person_workstreams(emp_id, assignments_df)
+            current_node['_count'] += count
+            current_node['_fte'] += fte / 100.0
+
+        leaf_nodes[path] = current_node
+
+    # Add people at leaf level
+    persons = pd.DataFrame({
+        'employee_id': people_df['employee_id'] if 'employee_id' in people_df.columns else people_df.get('resource_name', 'Unknown'),
+        'name': people_df.get('resource_name', 'Unknown'),
+        'type': people_df.get('type', 'Unknown'),
+        'allocation_pct': pct
+    }, index=people_df.index)
+
+    for path, (emp_id, name, person_type, allocation_pct) in zip(
+        paths.itertuples(index=False, name=None),
+        persons.itertuples(index=False, name=None)
+    ):
+        leaf_nodes[path][emp_id] = {
+            'name': name,
+            'type': person_type,
+            'allocation_pct': allocation_pct,
+            'workstreams': get_person_workstreams(emp_id, ws_by_emp)
         }
 
-        # Update counts up the tree
-        update_tree_counts(tree, hierarchy_levels, person)
-
     return tree
 
-def update_tree_counts(tree: Dict[str, Any], hierarchy_levels: list, person: pd.Series) -> None:
-    """Update counts and FTE in tree structure"""
-    current_node = tree
+def _numba_path_totals(paths: pd.DataFrame, pct) -> Optional[pd.DataFrame]:
+    """
+    Numba equivalent of the org path groupby in build_org_tree
 
-    for level in hierarchy_levels:
-        level_value = person.get(level, 'Unknown')
-        if pd.isna(level_value):
-            level_value = '(unknown)'
+    Each path's category codes are packed into one int64 key so the kernel
+    aggregates plain integers. Returns None when Numba is not installed or the
+    level cardinalities are too large to pack, leaving the caller on the
+    pandas groupby.
+    """
+    kernel = _path_key_kernel()
+    if kernel is None:
+        return None
+
+    levels = [paths[col].astype('category') for col in paths.columns]
+    sizes = [len(level.cat.categories) for level in levels]
+    if np.prod(sizes, dtype=object) >= 2 ** 62:
+        return None
+
+    keys = np.zeros(len(paths), dtype=np.int64)
+    for level, size in zip(levels, sizes):
+        keys = keys * size + level.cat.codes.to_numpy(dtype=np.int64)
+
+    pct_values = np.zeros(len(paths)) if np.isscalar(pct) else pct.to_numpy(dtype=np.float64, na_value=0.0)
+    uniq, counts, sums = kernel(keys, pct_values)
+
+    # Unpack the keys back into per-level labels, last level first
+    level_labels = []
+    for level, size in zip(reversed(levels), reversed(sizes)):
+        uniq, codes = np.divmod(uniq, size)
+        level_labels.append(level.cat.categories.take(codes))
+
+    index = pd.MultiIndex.from_arrays(level_labels[::-1], names=list(paths.columns))
+    return pd.DataFrame({'_count': counts, '_fte': sums}, index=index)
+
+def _fill_unknown(level_values: pd.Series) -> pd.Series:
+    """Label missing hierarchy values '(unknown)', registering the category if needed"""
+    if not level_values.hasnans:
+        return level_values
+    if isinstance(level_values.dtype, pd.CategoricalDtype) and '(unknown)' not in level_values.cat.categories:
+        level_values = level_values.cat.add_categories('(unknown)')
+    return level_values.fillna('(unknown)')
+
+def index_person_workstreams(assignments_df: pd.DataFrame) -> Dict[Any, list]:
+    """Map each employee ID to its workstream assignment records in one pass"""
+    ws_by_emp = {}
+    if assignments_df.empty:
+        return ws_by_emp
 
-        if level_value in current_node:
-            current_node[level_value]['_count'] += 1
-            current_node[level_value]['_fte'] += person.get('total_allocation_pct', 0) / 100.0
+    assigned = assignments_df[assignments_df['employee_id'].notna()]
+    records = assigned[['workstream', 'allocation_pct']].to_dict('records')
+    for emp_id, record in zip(assigned['employee_id'].tolist(), records):
+        ws_by_emp.setdefault(emp_id, []).append(record)
 
-        current_node = current_node[level_value]
+    return ws_by_emp
 
-def get_person_workstreams(employee_id: str, assignments_df: pd.DataFrame) -> list:
+def get_person_workstreams(employee_id: str, ws_by_emp: Dict[Any, list]) -> list:
     """Get workstream assignments for a person"""
-    if assignments_df.empty or not employee_id:
+    if not employee_id:
         return []
 
-    person_assignments = assignments_df[assignments_df['employee_id'] == employee_id]
-    return person_assignments[['workstream', 'allocation_pct']].to_dict('records')
+    return ws_by_emp.get(employee_id, [])
 
-def display_org_tree(tree_data: Dict[str, Any], people_df: pd.DataFrame, assignments_df: pd.DataFrame, prefix: str = "", level: int = 0) -> None:
+def display_org_tree(tree_data: Dict[str, Any], people_df: pd.DataFrame, assignments_df: pd.DataFrame, prefix: int = 0, level: int = 0) -> None:
     """
     Display the organizational tree with expandable nodes
 
@@ -215,7 +322,7 @@ def display_org_tree(tree_data: Dict[str, Any], people_df: pd.DataFrame, assignm
         tree_data: Tree structure dictionary
         people_df: People DataFrame
         assignments_df: Assignments DataFrame
-        prefix: Current path prefix for keys
+        prefix: Key of the parent node, used to keep widget keys unique
         level: Current hierarchy level
     """
 
@@ -223,8 +330,8 @@ def display_org_tree(tree_data: Dict[str, Any], people_df: pd.DataFrame, assignm
         if key.startswith('_'):
             continue  # Skip metadata keys
 
-        # Create unique key for this node
-        node_key = f"{prefix}_{key}_{level}"
+        # Create unique key for this node from its parent's key
+        node_key = hash((prefix, key, level))
 
         # Check if this is a leaf node (person)
         if isinstance(value, dict) and 'name' in value:
@@ -301,15 +408,7 @@ def show_resource_drawer(resource_name: str, people_df: pd.DataFrame, assignment
     st.write(f"**Total Allocation:** {total_pct:.1f}%")
 
     # Status flags
-    status_indicators = []
-    if resource.get('overallocated', False):
-        status_indicators.append("🔴 Overallocated")
-    if resource.get('underallocated', False):
-        status_indicators.append("🟡 Underallocated")
-    if resource.get('unassigned', False):
-        status_indicators.append("⚪ Unassigned")
-    if resource.get('allocation_mismatch', False):
-        status_indicators.append("⚠️ Allocation Mismatch")
+    status_indicators = [label for flag, label in _STATUS_MAP if resource.get(flag, False)]
 
     if status_indicators:
         st.write("**Status:** " + " | ".join(status_indicators))
@@ -328,14 +427,18 @@ def show_resource_drawer(resource_name: str, people_df: pd.DataFrame, assignment
                 st.write("No workstream assignments found.")
             else:
                 # Display as table
-                display_assignments = person_assignments[['workstream', 'allocation_pct']].copy()
-                display_assignments['allocation_pct'] = display_assignments['allocation_pct'].round(1)
-                display_assignments = display_assignments.rename(columns={
+                display_assignments = person_assignments[['workstream', 'allocation_pct']].rename(columns={
                     'workstream': 'Workstream',
                     'allocation_pct': 'Allocation %'
                 })
 
-                st.dataframe(display_assignments, use_container_width=True)
+                st.dataframe(
+                    display_assignments,
+                    column_config={
+                        "Allocation %": st.column_config.NumberColumn("Allocation %", format="%.1f")
+                    },
+                    use_container_width=True
+                )
 
                 # Workstream FTE summary
                 total_ws_pct = display_assignments['Allocation %'].sum()
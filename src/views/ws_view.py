@@ -5,10 +5,11 @@ Displays workstream assignments, FTE distribution, and drill-down capabilities
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from typing import Dict, Any, Optional
 
+from .caching import cache_frame
+from ..components.pagination import paginate
+
 def create_workstream_view(people_df: pd.DataFrame, assignments_df: pd.DataFrame) -> None:
     """
     Create the workstream analysis view
@@ -36,6 +37,13 @@ def create_workstream_view(people_df: pd.DataFrame, assignments_df: pd.DataFrame
     with tab3:
         create_resource_lookup(assignments_df, people_df)
 
+@cache_frame
+def _compute_ws_fte(assignments_df: pd.DataFrame) -> pd.Series:
+    """FTE per workstream, largest first"""
+    # Groups are left unsorted; the single sort by FTE below is the one that matters
+    ws_fte = assignments_df.groupby('workstream', sort=False, observed=True)['allocation_pct'].sum() / 100.0
+    return ws_fte.sort_values(ascending=False)
+
 def create_fte_distribution_chart(assignments_df: pd.DataFrame, people_df: pd.DataFrame) -> None:
     """
     Create FTE distribution chart by workstream
@@ -45,9 +53,11 @@ def create_fte_distribution_chart(assignments_df: pd.DataFrame, people_df: pd.Da
         people_df: People DataFrame
     """
 
+    # Plotly is only needed for this tab; import it on first use
+    import plotly.express as px
+
     # Calculate FTE by workstream
-    ws_fte = assignments_df.groupby('workstream')['allocation_pct'].sum() / 100.0
-    ws_fte = ws_fte.sort_values(ascending=False)
+    ws_fte = _compute_ws_fte(assignments_df)
 
     if ws_fte.empty:
         st.warning("No FTE data available for visualization.")
@@ -73,25 +83,25 @@ def create_fte_distribution_chart(assignments_df: pd.DataFrame, people_df: pd.Da
     st.plotly_chart(fig, use_container_width=True)
 
     # Summary statistics
+    desc = ws_fte.agg(['sum', 'mean', 'max', 'count'])
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Total Workstreams", f"{len(ws_fte):,}")
+        st.metric("Total Workstreams", f"{int(desc['count']):,}")
 
     with col2:
-        st.metric("Total FTE", f"{ws_fte.sum():.1f}")
+        st.metric("Total FTE", f"{desc['sum']:.1f}")
 
     with col3:
-        st.metric("Largest Workstream", f"{ws_fte.max():.1f} FTE")
+        st.metric("Largest Workstream", f"{desc['max']:.1f} FTE")
 
     with col4:
-        st.metric("Avg FTE per Workstream", f"{ws_fte.mean():.1f}")
+        st.metric("Avg FTE per Workstream", f"{desc['mean']:.1f}")
 
     # Top workstreams table
     st.subheader("🏆 Top Workstreams by FTE")
 
     top_ws_df = ws_fte.head(10).reset_index()
-    top_ws_df['allocation_pct'] = top_ws_df['allocation_pct'].round(2)
     top_ws_df.columns = ['Workstream', 'FTE']
 
     st.dataframe(
@@ -103,28 +113,29 @@ def create_fte_distribution_chart(assignments_df: pd.DataFrame, people_df: pd.Da
         hide_index=True
     )
 
-def create_assignments_table(assignments_df: pd.DataFrame, people_df: pd.DataFrame) -> None:
-    """
-    Create detailed assignments table with drill-down
+def _workstream_options(workstreams: pd.Series) -> list:
+    """Sorted distinct workstream names for selector widgets"""
+    if isinstance(workstreams.dtype, pd.CategoricalDtype):
+        # Categories are already distinct and sorted from ingest
+        return workstreams.cat.remove_unused_categories().cat.categories.tolist()
+    return sorted(workstreams.unique())
 
-    Args:
-        assignments_df: Assignments DataFrame
-        people_df: Assignments DataFrame
-    """
+@cache_frame
+def _build_assignments_display(assignments_df: pd.DataFrame, people_df: pd.DataFrame) -> pd.DataFrame:
+    """Assignments joined to people details, renamed and sorted for display"""
 
-    # Merge assignments with people data for richer display
+    # Join people details onto assignments through an employee_id-indexed
+    # lookup (a left join, like the merge it replaces, without re-hashing both sides)
     if not people_df.empty and 'employee_id' in assignments_df.columns:
-        merged_df = assignments_df.merge(
-            people_df[['employee_id', 'resource_name', 'type', 'manager', 'total_allocation_pct']],
-            on='employee_id',
-            how='left'
-        )
+        person_lookup = people_df.set_index('employee_id')[['resource_name', 'type', 'manager', 'total_allocation_pct']]
+        merged_df = assignments_df.join(person_lookup, on='employee_id')
     else:
-        merged_df = assignments_df.copy()
-        merged_df['resource_name'] = 'Unknown'
-        merged_df['type'] = 'Unknown'
-        merged_df['manager'] = 'Unknown'
-        merged_df['total_allocation_pct'] = 0.0
+        merged_df = assignments_df.assign(
+            resource_name='Unknown',
+            type='Unknown',
+            manager='Unknown',
+            total_allocation_pct=0.0
+        )
 
     # Select and rename columns for display
     display_cols = [
@@ -133,15 +144,9 @@ def create_assignments_table(assignments_df: pd.DataFrame, people_df: pd.DataFra
     ]
 
     available_cols = [col for col in display_cols if col in merged_df.columns]
-    display_df = merged_df[available_cols].copy()
+    display_df = merged_df[available_cols]
 
-    # Format percentages
-    pct_cols = ['allocation_pct', 'total_allocation_pct']
-    for col in pct_cols:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].round(1)
-
-    # Rename columns
+    # Rename columns (percentages are formatted by the table's column_config)
     column_names = {
         'workstream': 'Workstream',
         'resource_name': 'Resource',
@@ -155,9 +160,22 @@ def create_assignments_table(assignments_df: pd.DataFrame, people_df: pd.DataFra
     # Sort by workstream and allocation percentage
     display_df = display_df.sort_values(['Workstream', 'Workstream %'], ascending=[True, False])
 
-    # Display table
+    return display_df
+
+def create_assignments_table(assignments_df: pd.DataFrame, people_df: pd.DataFrame) -> None:
+    """
+    Create detailed assignments table with drill-down
+
+    Args:
+        assignments_df: Assignments DataFrame
+        people_df: Assignments DataFrame
+    """
+
+    display_df = _build_assignments_display(assignments_df, people_df)
+
+    # Display one page of the table; the drill-down below still uses every row
     st.dataframe(
-        display_df,
+        paginate(display_df, key="assignments_table_page"),
         column_config={
             "Workstream %": st.column_config.NumberColumn("Workstream %", format="%.1f%%"),
             "Total Allocation %": st.column_config.NumberColumn("Total Allocation %", format="%.1f%%")
@@ -169,7 +187,7 @@ def create_assignments_table(assignments_df: pd.DataFrame, people_df: pd.DataFra
     # Workstream selector for drill-down
     st.subheader("🔍 Drill-down by Workstream")
 
-    workstreams = sorted(display_df['Workstream'].unique())
+    workstreams = _workstream_options(display_df['Workstream'])
     selected_workstream = st.selectbox(
         "Select a workstream to view detailed assignments:",
         options=[""] + workstreams,
@@ -179,17 +197,17 @@ def create_assignments_table(assignments_df: pd.DataFrame, people_df: pd.DataFra
     if selected_workstream:
         show_workstream_details(selected_workstream, display_df, people_df)
 
-def show_workstream_details(workstream: str, assignments_df: pd.DataFrame, people_df: pd.DataFrame) -> None:
+def show_workstream_details(workstream: str, display_df: pd.DataFrame, people_df: pd.DataFrame) -> None:
     """
     Show detailed view for a specific workstream
 
     Args:
         workstream: Selected workstream name
-        assignments_df: Assignments DataFrame
+        display_df: Display assignments DataFrame
         people_df: People DataFrame
     """
 
-    ws_assignments = assignments_df[assignments_df['Workstream'] == workstream]
+    ws_assignments = display_df[display_df['Workstream'] == workstream]
 
     if ws_assignments.empty:
         st.warning(f"No assignments found for workstream: {workstream}")
@@ -240,7 +258,7 @@ def create_resource_lookup(assignments_df: pd.DataFrame, people_df: pd.DataFrame
     st.subheader("🔍 Find Resources by Workstream")
 
     # Multi-select workstreams
-    workstreams = sorted(assignments_df['workstream'].unique())
+    workstreams = _workstream_options(assignments_df['workstream'])
     selected_workstreams = st.multiselect(
         "Select workstreams to find assigned resources:",
         options=workstreams,
@@ -264,7 +282,7 @@ def create_resource_lookup(assignments_df: pd.DataFrame, people_df: pd.DataFrame
 
     # Merge with people data
     if not people_df.empty and len(unique_resources) > 0:
-        resource_details = people_df[people_df['employee_id'].isin(unique_resources)].copy()
+        resource_details = people_df[people_df['employee_id'].isin(unique_resources)]
     else:
         # Fallback if no people data or no employee IDs
         resource_details = pd.DataFrame()
@@ -288,19 +306,13 @@ def create_resource_lookup(assignments_df: pd.DataFrame, people_df: pd.DataFrame
     # Show detailed breakdown
     st.subheader("📊 Assignment Breakdown")
 
-    # Create summary by workstream
-    ws_summary = []
-    for ws in selected_workstreams:
-        ws_data = filtered_assignments[filtered_assignments['workstream'] == ws]
-        ws_summary.append({
-            'Workstream': ws,
-            'Resources': len(ws_data),
-            'FTE': ws_data['allocation_pct'].sum() / 100.0,
-            'Avg Allocation': ws_data['allocation_pct'].mean()
-        })
-
-    summary_df = pd.DataFrame(ws_summary)
-    summary_df = summary_df.round({'FTE': 2, 'Avg Allocation': 1})
+    # Create summary by workstream in one grouped pass, kept in selection order
+    summary_df = filtered_assignments.groupby('workstream', sort=False, observed=True).agg(**{
+        'Resources': ('allocation_pct', 'size'),
+        'FTE': ('allocation_pct', 'sum'),
+        'Avg Allocation': ('allocation_pct', 'mean')
+    }).reindex(selected_workstreams).rename_axis('Workstream').reset_index()
+    summary_df['FTE'] = summary_df['FTE'] / 100.0
 
     st.dataframe(
         summary_df,
@@ -317,27 +329,23 @@ def create_resource_lookup(assignments_df: pd.DataFrame, people_df: pd.DataFrame
         st.subheader("📋 Detailed Resource Assignments")
 
         # Merge assignments with resource details
-        detailed_view = filtered_assignments.copy()
-
         if not resource_details.empty:
-            detailed_view = detailed_view.merge(
+            detailed_view = filtered_assignments.merge(
                 resource_details[['employee_id', 'resource_name', 'type', 'manager']],
                 on='employee_id',
                 how='left'
             )
         else:
-            detailed_view['resource_name'] = 'Unknown'
-            detailed_view['type'] = 'Unknown'
-            detailed_view['manager'] = 'Unknown'
+            detailed_view = filtered_assignments.assign(
+                resource_name='Unknown',
+                type='Unknown',
+                manager='Unknown'
+            )
 
         # Select and format columns
         display_cols = ['workstream', 'resource_name', 'type', 'manager', 'allocation_pct']
         available_cols = [col for col in display_cols if col in detailed_view.columns]
-        display_df = detailed_view[available_cols].copy()
-
-        display_df['allocation_pct'] = display_df['allocation_pct'].round(1)
-
-        display_df = display_df.rename(columns={
+        display_df = detailed_view[available_cols].rename(columns={
             'workstream': 'Workstream',
             'resource_name': 'Resource',
             'type': 'Type',
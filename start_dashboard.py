@@ -7,6 +7,8 @@ Run this to automatically start the Streamlit dashboard
 import subprocess
 import sys
 import os
+import signal
+import importlib.util
 import time
 import webbrowser
 from pathlib import Path
@@ -23,7 +25,11 @@ def check_python():
         return False
 
 def install_requirements():
-    """Install required packages"""
+    """Install required packages, unless the core ones are already importable"""
+    if all(importlib.util.find_spec(name) for name in ('streamlit', 'pandas', 'plotly')):
+        print("✅ Dependencies already installed")
+        return True
+
     print("🔄 Installing required packages...")
     try:
         subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'], 
@@ -76,12 +82,24 @@ def start_streamlit():
         browser_thread.start()
         
         # Start Streamlit
-        subprocess.run([
+        streamlit_cmd = [
             sys.executable, '-m', 'streamlit', 'run', 'app.py',
             '--server.headless', 'false',
             '--server.port', '8501',
             '--browser.gatherUsageStats', 'false'
-        ])
+        ]
+        if hasattr(os, 'posix_spawn'):
+            # posix_spawn skips duplicating this interpreter's page tables
+            pid = os.posix_spawn(sys.executable, streamlit_cmd, os.environ)
+            try:
+                os.waitpid(pid, 0)
+            except KeyboardInterrupt:
+                # Stop and reap Streamlit as subprocess.run would, then report the stop
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+                raise
+        else:
+            subprocess.run(streamlit_cmd)
         
     except KeyboardInterrupt:
         print("\n🛑 Dashboard stopped by user")
@@ -5,53 +5,275 @@ Fixed dashboard starter - automatically finds available port
 
 import subprocess
 import sys
+import os
+import json
+import atexit
 import socket
 import webbrowser
 import time
 import threading
+import importlib.util
+from pathlib import Path
+
+# Interface the dashboard listens on; set PET_DASHBOARD_BIND=0.0.0.0 for LAN access.
+# The IPv4 literal skips resolving localhost, which may come back IPv6 first.
+BIND_ADDRESS = os.environ.get('PET_DASHBOARD_BIND', '127.0.0.1')
+# Address this machine's clients (port checks, the browser) use to reach it
+LOCAL_ADDRESS = '127.0.0.1' if BIND_ADDRESS in ('', '0.0.0.0') else BIND_ADDRESS
+
+# Records the PID and port of the running dashboard so relaunches can reuse it
+LOCK_FILE = Path.home() / '.cache' / 'pet-dashboard.lock'
+
+# Always-on dashboard installed by `start_dashboard_fixed.py install-daemon`
+DAEMON_PORT = 8501
+DAEMON_UNIT = Path.home() / '.config' / 'systemd' / 'user' / 'pet-dashboard.service'
+
+# Streamlit's CLI script, run directly so the child skips `-m` module lookup
+try:
+    _cli_spec = importlib.util.find_spec('streamlit.web.cli')
+except ImportError:
+    _cli_spec = None
+STREAMLIT_CLI = [_cli_spec.origin] if _cli_spec and _cli_spec.origin else ['-m', 'streamlit']
+
+# Browser controller, resolved once instead of on every webbrowser.open
+try:
+    BROWSER = webbrowser.get()
+except webbrowser.Error:
+    BROWSER = None
+
+def open_url(url):
+    """Open url with the pre-selected browser, if one was found"""
+    if BROWSER is not None:
+        BROWSER.open(url)
+
+# Streamlit options for normal use: no file watching or rerun-on-save.
+# Set PET_DASHBOARD_DEV=1 to keep Streamlit's development defaults.
+PRODUCTION_OPTIONS = {
+    'server_fileWatcherType': 'none',
+    'server_runOnSave': False,
+    'global_developmentMode': False,
+    'client_toolbarMode': 'minimal'
+}
+
+# Heavy modules app.py imports on its first run, loaded while the server starts
+PRELOAD_MODULES = ('pandas', 'pyarrow', 'plotly.express', 'plotly.graph_objects')
+
+def preload_modules():
+    """Import PRELOAD_MODULES so the first page render finds them loaded"""
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+def streamlit_flag_options(port, headless):
+    """Streamlit config options for serving the dashboard on BIND_ADDRESS:port"""
+    flag_options = {
+        'server_port': port,
+        'server_address': BIND_ADDRESS,
+        'server_headless': headless,
+        'browser_gatherUsageStats': False
+    }
+    if os.environ.get('PET_DASHBOARD_DEV') != '1':
+        flag_options.update(PRODUCTION_OPTIONS)
+    return flag_options
+
+def streamlit_command(app_path, flag_options):
+    """Command line running Streamlit's CLI on app_path with flag_options"""
+    cmd = [sys.executable, *STREAMLIT_CLI, 'run', str(app_path)]
+    for name, value in flag_options.items():
+        cmd += ['--' + name.replace('_', '.', 1), str(value).lower()]
+    return cmd
+
+def _bind_probe(port):
+    """Listening socket on BIND_ADDRESS:port (0 for any free port); raises OSError if taken"""
+    # create_server sets SO_REUSEADDR except on Windows (where it would also allow
+    # binding ports in use), so ports still in TIME_WAIT from a previous run count as free
+    return socket.create_server((BIND_ADDRESS, port), reuse_port=hasattr(socket, 'SO_REUSEPORT'))
+
+def find_free_port(prefer_range=False):
+    """
+    Find an available port
+
+    By default the OS picks a free ephemeral port in a single bind. With
+    prefer_range, ports 8501-8509 are checked with a connect first to keep
+    the usual Streamlit port, falling back to an ephemeral port when all are
+    taken. Either way the port is only free at the time of the probe;
+    Streamlit's own bind is the one that counts.
+    """
+    if not prefer_range:
+        with _bind_probe(0) as s:
+            return s.getsockname()[1]
 
-def find_free_port():
-    """Find an available port starting from 8501"""
     for port in range(8501, 8510):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            try:
-                s.bind(('localhost', port))
-                return port
-            except OSError:
-                continue
-    return 8501  # fallback
-
-def open_browser_delayed(port):
-    """Open browser after a delay"""
-    time.sleep(4)
-    webbrowser.open(f'http://localhost:{port}')
+        if not _port_in_use(port):
+            return port
+    return find_free_port()  # whole range taken; let the OS pick
+
+def _port_in_use(port):
+    """Whether something accepts connections on port; a failed connect counts as free"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.05)
+        try:
+            s.connect((LOCAL_ADDRESS, port))
+        except OSError:
+            # Refused, timed out or unreachable: nothing is listening for us
+            return False
+    return True
+
+def running_dashboard_port():
+    """Port of a dashboard already running per the lockfile or the daemon, or None"""
+    try:
+        lock = json.loads(LOCK_FILE.read_text())
+        pid, port = int(lock['pid']), int(lock['port'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    else:
+        try:
+            # Signal 0 only checks the PID exists (on Windows os.kill would terminate it)
+            if os.name != 'nt':
+                os.kill(pid, 0)
+            socket.create_connection((LOCAL_ADDRESS, port), timeout=0.2).close()
+            return port
+        except OSError:
+            # Left behind by a launcher that exec'd into Streamlit and has since exited
+            LOCK_FILE.unlink(missing_ok=True)
+
+    if DAEMON_UNIT.exists():
+        try:
+            socket.create_connection((LOCAL_ADDRESS, DAEMON_PORT), timeout=0.2).close()
+            return DAEMON_PORT
+        except OSError:
+            pass
+    return None
+
+def install_daemon():
+    """Install and start a systemd user service that keeps the dashboard running"""
+    if not sys.platform.startswith('linux'):
+        sys.stdout.write("❌ install-daemon needs systemd (Linux); start the dashboard normally instead\n")
+        return False
+
+    app_dir = Path(__file__).resolve().parent
+    cmd = streamlit_command(app_dir / 'app.py', streamlit_flag_options(DAEMON_PORT, headless=True))
+    exec_start = ' '.join(f'"{arg}"' if ' ' in arg else arg for arg in cmd)
+    DAEMON_UNIT.parent.mkdir(parents=True, exist_ok=True)
+    DAEMON_UNIT.write_text(
+        "[Unit]\n"
+        "Description=PET Resource Allocation Dashboard\n"
+        "\n"
+        "[Service]\n"
+        f"WorkingDirectory={app_dir}\n"
+        f"ExecStart={exec_start}\n"
+        "Restart=on-failure\n"
+        "\n"
+        "[Install]\n"
+        "WantedBy=default.target\n"
+    )
+
+    try:
+        subprocess.run(['systemctl', '--user', 'daemon-reload'], check=True)
+        subprocess.run(['systemctl', '--user', 'enable', '--now', 'pet-dashboard'], check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        sys.stdout.write(f"❌ Wrote {DAEMON_UNIT} but could not start it: {e}\n")
+        return False
+
+    sys.stdout.write(f"✅ Dashboard service running at http://{LOCAL_ADDRESS}:{DAEMON_PORT}\n")
+    return True
+
+def write_lock(port):
+    """Record this process's dashboard port, removing the lockfile on exit
+
+    After os.execvp the PID is unchanged, so the record stays accurate while
+    Streamlit serves, but atexit hooks never run; running_dashboard_port
+    removes the lockfile once that PID or port is gone.
+    """
+    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    LOCK_FILE.write_text(json.dumps({'pid': os.getpid(), 'port': port}))
+    atexit.register(LOCK_FILE.unlink, missing_ok=True)
+
+def open_browser_when_ready(port, timeout=10.0):
+    """Open the browser as soon as Streamlit accepts connections on port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((LOCAL_ADDRESS, port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    open_url(f'http://{LOCAL_ADDRESS}:{port}')
+
+def spawn_browser_opener(port):
+    """Run open_browser_when_ready in a detached grandchild that survives exec (POSIX)"""
+    sys.stdout.flush()
+    pid = os.fork()
+    if pid == 0:
+        # Double fork so the opener is reparented to init and never left a zombie
+        try:
+            if os.fork() == 0:
+                open_browser_when_ready(port)
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+BANNER_TITLE = f"🎯 PET Resource Allocation Dashboard - Auto Port\n{'=' * 60}\n"
 
 def main():
-    print("🎯 PET Resource Allocation Dashboard - Auto Port")
-    print("=" * 60)
+    if sys.argv[1:] == ['install-daemon']:
+        install_daemon()
+        return
+
+    # Reuse a dashboard that is already running instead of starting another
+    port = running_dashboard_port()
+    if port is not None:
+        sys.stdout.write(f"{BANNER_TITLE}✅ Dashboard already running at http://{LOCAL_ADDRESS}:{port}\n")
+        sys.stdout.flush()
+        open_url(f'http://{LOCAL_ADDRESS}:{port}')
+        return
     
-    # Find available port
-    port = find_free_port()
-    print(f"🔗 Starting dashboard on port {port}")
-    print(f"📊 URL: http://localhost:{port}")
-    print("🛑 Press Ctrl+C to stop")
-    print("=" * 60)
+    # Find available port, keeping Streamlit's usual 8501 when it is free
+    port = find_free_port(prefer_range=True)
+    write_lock(port)
+    sys.stdout.write(
+        f"{BANNER_TITLE}"
+        f"🔗 Starting dashboard on port {port}\n"
+        f"📊 URL: http://{LOCAL_ADDRESS}:{port}\n"
+        f"🛑 Press Ctrl+C to stop\n"
+        f"{'=' * 60}\n"
+    )
+    sys.stdout.flush()
     
+    flag_options = streamlit_flag_options(port, headless=False)
+    streamlit_cmd = streamlit_command('app.py', flag_options)
+
+    try:
+        from streamlit.web import bootstrap
+    except ImportError:
+        # Streamlit's internal API moved; go through its CLI instead
+        bootstrap = None
+
+    if bootstrap is None and os.name == 'posix':
+        # Replace this process with Streamlit rather than waiting on a child;
+        # it keeps this PID, so the lockfile written above still names it
+        spawn_browser_opener(port)
+        os.execvp(sys.executable, streamlit_cmd)
+
     # Start browser opener in background
-    browser_thread = threading.Thread(target=open_browser_delayed, args=(port,))
-    browser_thread.daemon = True
-    browser_thread.start()
+    browser_timer = threading.Timer(0.1, open_browser_when_ready, args=(port,))
+    browser_timer.daemon = True
+    browser_timer.start()
     
     try:
-        # Start Streamlit
-        subprocess.run([
-            sys.executable, '-m', 'streamlit', 'run', 'app.py',
-            '--server.port', str(port),
-            '--server.headless', 'false',
-            '--browser.gatherUsageStats', 'false'
-        ])
+        if bootstrap is not None:
+            # Serve the app from this interpreter, skipping a second Python startup;
+            # app.py's heavy imports load in the background meanwhile
+            threading.Thread(target=preload_modules, daemon=True).start()
+            bootstrap.load_config_options(flag_options=flag_options)
+            bootstrap.run('app.py', is_hello=False, args=[], flag_options=flag_options)
+        else:
+            subprocess.run(streamlit_cmd)
     except KeyboardInterrupt:
-        print("\n🛑 Dashboard stopped")
+        sys.stdout.write("\n🛑 Dashboard stopped\n")
+        sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
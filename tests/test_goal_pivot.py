@@ -0,0 +1,61 @@
+"""
+Regression tests for the goal pivot's axis ordering
+"""
+
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src.views import goal_view
+from src.views.goal_view import _pivot_goals
+
+def make_goals():
+    """Goal rows whose first-seen order differs from sorted order"""
+    return pd.DataFrame({
+        'Workstream Name': ['Zeta', 'Alpha', 'Mid', 'Zeta', 'Alpha', 'Beta', 'Mid'],
+        'Goal Name': ['Grow', 'Save', 'Grow', 'Act', 'Act', 'Save', 'Act'],
+        'L4 Leaders': ['B', 'B', 'A', 'B', 'B', 'A', 'A'],
+        'Allocation %': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0],
+    })
+
+class PivotGoalsTest(unittest.TestCase):
+    """_pivot_goals must order its axes like pivot_table(aggfunc='first')"""
+
+    def assert_matches_pivot_table(self, subset):
+        expected = subset.pivot_table(
+            index='Workstream Name', columns='Goal Name', values='Allocation %',
+            aggfunc='first', observed=True
+        )
+        source = subset[['Workstream Name', 'Goal Name', 'Allocation %']]
+        result = _pivot_goals(source, 'Allocation %')
+
+        self.assertEqual(list(result.index), list(expected.index))
+        self.assertEqual(list(result.columns), list(expected.columns))
+        pd.testing.assert_frame_equal(result, expected, check_index_type=False, check_column_type=False, check_names=False)
+
+    def test_filtered_subset_axes_sorted(self):
+        goals = make_goals()
+        self.assert_matches_pivot_table(goals[goals['L4 Leaders'] == 'B'])
+        self.assert_matches_pivot_table(goals[goals['L4 Leaders'] == 'A'])
+
+    def test_categorical_subset_axes_sorted(self):
+        goals = make_goals().astype({'Workstream Name': 'category', 'Goal Name': 'category'})
+        self.assert_matches_pivot_table(goals[goals['L4 Leaders'] == 'B'])
+
+    def test_polars_path_matches_pandas_path(self):
+        try:
+            import polars  # noqa: F401
+        except ImportError:
+            self.skipTest("polars is not installed")
+
+        goals = make_goals()
+        source = goals.loc[goals['L4 Leaders'] == 'B', ['Workstream Name', 'Goal Name', 'Allocation %']]
+        pandas_result = _pivot_goals(source, 'Allocation %')
+        with mock.patch.object(goal_view, 'POLARS_PIVOT_MIN_ROWS', 0):
+            polars_result = _pivot_goals(source, 'Allocation %')
+
+        pd.testing.assert_frame_equal(polars_result, pandas_result, check_index_type=False, check_column_type=False)
+
+if __name__ == '__main__':
+    unittest.main()
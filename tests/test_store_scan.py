@@ -0,0 +1,98 @@
+"""
+Regression tests for the data store's memoized directory scan
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.store import PETDataStore
+
+def backdate(path, seconds=60):
+    """Set path's mtime safely outside the scan's coarse-mtime window"""
+    mtime_ns = time.time_ns() - seconds * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return mtime_ns
+
+class ScanMatchingTest(unittest.TestCase):
+    """_scan_matching must never serve a directory listing that went stale"""
+
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.data_dir, ignore_errors=True)
+        self.store = PETDataStore(str(self.data_dir))
+
+    def write_csv(self, name):
+        path = self.data_dir / name
+        path.write_text("a,b\n1,2\n")
+        return path
+
+    def scanned_names(self):
+        return sorted(Path(path).name for path, _ in self.store._scan_matching())
+
+    def test_scan_is_memoized_on_old_directory_mtime(self):
+        self.write_csv("PET Resource Allocation 1.csv")
+        self.write_csv("notes.csv")
+        backdate(self.data_dir)
+
+        self.assertEqual(self.scanned_names(), ["PET Resource Allocation 1.csv"])
+        self.assertIsNotNone(self.store._scan_cache)
+
+    def test_recent_directory_change_is_not_memoized(self):
+        self.write_csv("PET Resource Allocation 1.csv")
+
+        self.scanned_names()
+        self.assertIsNone(self.store._scan_cache)
+
+    def test_file_rewritten_in_place_is_restatted(self):
+        path = self.write_csv("PET Resource Allocation 1.csv")
+        backdate(path, seconds=120)
+        backdate(self.data_dir)
+        self.store._scan_matching()
+
+        path.write_text("a,b\n1,2\n3,4\n")
+        dir_mtime_ns = backdate(self.data_dir)
+        (_, stat), = self.store._scan_matching()
+
+        self.assertEqual(self.store._scan_cache[0], dir_mtime_ns)
+        self.assertEqual(stat.st_size, path.stat().st_size)
+        self.assertEqual(stat.st_mtime_ns, path.stat().st_mtime_ns)
+
+    def test_added_file_changes_directory_mtime(self):
+        self.write_csv("PET Resource Allocation 1.csv")
+        backdate(self.data_dir, seconds=120)
+        self.scanned_names()
+
+        self.write_csv("PET Resource Allocation 2.csv")
+        backdate(self.data_dir)
+
+        self.assertEqual(self.scanned_names(), [
+            "PET Resource Allocation 1.csv", "PET Resource Allocation 2.csv"
+        ])
+
+    def test_vanished_path_forces_rescan(self):
+        self.write_csv("PET Resource Allocation 1.csv")
+        removed = self.write_csv("PET Resource Allocation 2.csv")
+        dir_mtime_ns = backdate(self.data_dir)
+        self.scanned_names()
+
+        # Same directory mtime as the memo, as a coarse-resolution filesystem could report
+        removed.unlink()
+        os.utime(self.data_dir, ns=(dir_mtime_ns, dir_mtime_ns))
+
+        self.assertEqual(self.scanned_names(), ["PET Resource Allocation 1.csv"])
+        self.assertEqual(self.store._scan_cache[1], [str(self.data_dir / "PET Resource Allocation 1.csv")])
+
+    def test_invalidate_scan_drops_memo(self):
+        self.write_csv("PET Resource Allocation 1.csv")
+        backdate(self.data_dir)
+        self.scanned_names()
+
+        self.store._invalidate_scan()
+        self.assertIsNone(self.store._scan_cache)
+
+if __name__ == '__main__':
+    unittest.main()